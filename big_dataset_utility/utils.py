@@ -161,9 +161,9 @@ def test_admit_bf_incons(shuffles):
                 cb_power = cb.order.PD.cb_power()
                 if polarity == decision_enum.pi:
                     pi_factors = add_dict(pi_factors, new_case.reason)
-                    delta_factors = add_dict(delta_factors, new_case.defeated())
+                    delta_factors = add_dict(delta_factors, new_case.defeated)
                 else:
-                    pi_factors = add_dict(pi_factors, new_case.defeated())
+                    pi_factors = add_dict(pi_factors, new_case.defeated)
                     delta_factors = add_dict(delta_factors, new_case.reason)
                 break
         powers.append(cb_power)
@@ -0,0 +1,12 @@
+import yaml
+
+# libyaml-backed parser when PyYAML was built with it, much faster on large case bases
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def load_yaml(stream):
+    """
+    @param stream: a YAML string or open file
+    @return: the parsed YAML, as yaml.safe_load would return it
+    """
+    return yaml.load(stream, Loader=_Loader)
@@ -74,21 +74,32 @@ class AdmissibilityConstraints:
         """Minimal relevant differences admissibility constraint
          4. For all cases in the CB the new case must be minimally relevant different to
             a case with the same polarity"""
-        current_case = Case.from_reason_defeated(new_reason, new_defeated)
-        opposing_case = current_case.polar_opposite()
+        decision = Case.from_reason_defeated(new_reason, new_defeated).decision
+        lookup = self.priority_order.universe.lookup
+        reason_mask = lookup(new_reason)
+        defeated_mask = lookup(new_defeated)
+        # factors missing from the universe are in no case of the case base,
+        # so each is a relevant difference from every case
+        unknown_reason = len(new_reason) - reason_mask.bit_count()
+        unknown_defeated = len(new_defeated) - defeated_mask.bit_count()
         min_case_size = 99999999999999999999
-        best_case = current_case
-        for case in self.priority_order.get_cases():
-            if case.decision == current_case.decision:
-                diffs = len(current_case.relevant_diff_from(case))
+        best_decision = decision
+        for case_decision, case_reason, case_defeated in self.priority_order.get_case_masks():
+            if case_decision == decision:
+                # the relevant differences from the case to the new case
+                diff = case_reason & ~reason_mask | defeated_mask & ~case_defeated
+                diffs = diff.bit_count() + unknown_defeated
             else:
-                diffs = len(opposing_case.relevant_diff_from(case))
+                # the relevant differences from the case to the polar opposite of the new case,
+                # whose reason is new_defeated and whose defeated is new_reason
+                diff = case_reason & ~defeated_mask | reason_mask & ~case_defeated
+                diffs = diff.bit_count() + unknown_reason
             if min_case_size >= diffs:
-                if min_case_size == diffs and best_case.decision == current_case.decision:
+                if min_case_size == diffs and best_decision == decision:
                     continue
                 min_case_size = diffs
-                best_case = case
-        if best_case.decision != current_case.decision:
+                best_decision = case_decision
+        if best_decision != decision:
             return False
         else:
             return True
@@ -112,7 +123,6 @@ class AdmissibilityConstraints:
                     continue
                 max_case_intersects = diffs
                 best_case = case
-        print(best_case)
         if best_case.decision != current_case.decision:
             return False
         else:
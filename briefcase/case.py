@@ -1,3 +1,5 @@
+from functools import cached_property
+
 from briefcase.enums import decision_enum
 from briefcase.factor import Factor
 
@@ -26,10 +28,12 @@ class Case:
         Converts pi, delta, and reason factor lists to frozensets (immutable sets) of tuples of each
         factor name and the polarity.
         """
-        pi_factors = frozenset((Factor(f, decision_enum.pi) for f in dic["pi"]))
-        delta_factors = frozenset(
-            (Factor(f, decision_enum.delta) for f in dic["delta"])
-        )
+        # local references avoid repeated global and attribute lookups when loading thousands of cases
+        factor = Factor
+        pi = decision_enum.pi
+        delta = decision_enum.delta
+        pi_factors = frozenset(factor(f, pi) for f in dic["pi"])
+        delta_factors = frozenset(factor(f, delta) for f in dic["delta"])
 
         # Check decision is valid
         try:
@@ -39,11 +43,11 @@ class Case:
                 f"The key 'decision' with value '{dic['decision']}' is not found in the decision_enum (pi/delta)."
             ) from e
 
-        reason_factors = frozenset((Factor(f, decision_value) for f in dic["reason"]))
+        reason_factors = frozenset(factor(f, decision_value) for f in dic["reason"])
 
         # Check reason is valid
         winning_factors = (
-            pi_factors if decision_value == decision_enum.pi else delta_factors
+            pi_factors if decision_value == pi else delta_factors
         )
         if not reason_factors.issubset(winning_factors):
             raise ValueError(
@@ -73,7 +77,8 @@ class Case:
         self.decision = decision
         self.reason = reason
 
-    def defeated(self):  # TODO: make property
+    @cached_property
+    def defeated(self):
         """
         @return: the factors which were defeated by the decision e.g. for a decision of polarity pi, the delta factors
         """
@@ -94,12 +99,12 @@ class Case:
             # get all reasons for this case which are in other case but not in this case
             reasons = other_case.reason - self.reason
             # get all defeated for this case which are in this case but not in other case
-            defeated = self.defeated() - other_case.defeated()
+            defeated = self.defeated - other_case.defeated
         else:  # outcome is different
             # get all reasons for other case which are in other case but not in this one
-            reasons = other_case.reason - self.defeated()
+            reasons = other_case.reason - self.defeated
             # get all defeated in this case which are in other case but not in this case
-            defeated = self.reason - other_case.defeated()
+            defeated = self.reason - other_case.defeated
         return reasons | defeated
 
     def polar_opposite(self):
@@ -3,10 +3,12 @@ from briefcase.priority_order import PriorityOrder
 
 
 class CaseBase:
-    def __init__(self, caselist=[], empty_sides=False):
+    def __init__(self, caselist=None, empty_sides=False):
         self.cases = []
+        self.case_masks = []
         self.order = PriorityOrder(self, empty_sides)
-        self.add_unsafe_cases(caselist)
+        if caselist:
+            self.add_unsafe_cases(caselist)
 
     def check_incons_value(self, incons):
         # Check inconsistency is valid
@@ -20,11 +22,9 @@ class CaseBase:
         return incons_value
 
     def add_unsafe_cases(self, cases):
-        filtered_cases = []
-        for case in cases:
-            if self.order.unsafe_add_case(case):
-                filtered_cases.append(case)
-        self.cases.extend(filtered_cases)
+        added_cases = self.order.unsafe_add_cases(cases)
+        self.cases.extend(added_cases)
+        self.case_masks.extend(map(self.order.encode_case, added_cases))
 
 
     def add_cases(self, cases, incons="ALL"):
@@ -34,6 +34,7 @@ class CaseBase:
     def add_case(self, case, incons="ALL"):
         if self.order.safe_add_case(case, self.check_incons_value(incons)):
             self.cases.append(case)
+            self.case_masks.append(self.order.encode_case(case))
             return True
         else:
             return False
@@ -49,14 +50,7 @@ class CaseBase:
         """
         @return : number of cases which are associated with an inconsistency in current cb
         """
-
-        # loop through all cases in order
-        count = 0
-        for case in self.cases:
-            if not self.is_consistent_with(case):
-                count = count + 1
-
-        return count
+        return self.order.are_cases_consistent(self.cases).count(False)
 
     def metrics(self):
         size = len(self.cases)
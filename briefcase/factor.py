@@ -1,31 +1,19 @@
+from dataclasses import dataclass
+
+from briefcase.enums import decision_enum
+
+
+@dataclass(frozen=True, slots=True)
 class Factor:
     """Class describing a factor which contributes to a decision
     e.g. factor 1, name = "child ate their dinner", polarity = pi (child can have dessert)
+    @param name: name of the given factor
+    @param polarity: the result of the decision (pi/delta/undecided)
+    Equality and hash are based on factor name and factor polarity
     """
 
-    def __init__(self, name, polarity="un"):
-        """
-        @param name: name of the given factor
-        @param polarity: the result of the decision (pi/delta/undecided)
-        """
-        self.name = name
-        self.polarity = polarity
-
-    def __eq__(self, other):
-        """
-        @param other: second factor, to compare instance factor to
-        @return: override equality return based on factor name and factor polarity
-        """
-        if type(other) is type(self):
-            return self.name == other.name and self.polarity == other.polarity
-        else:
-            return False
-
-    def __hash__(self):
-        """
-        @return: override hash of factor based on factor name and factor polarity
-        """
-        return hash(self.name + str(self.polarity))
+    name: str
+    polarity: decision_enum | str = "un"
 
     def __str__(self):
         """
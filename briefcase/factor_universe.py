@@ -0,0 +1,72 @@
+def iter_bits(mask):
+    """
+    @param mask: a non-negative integer
+    @return: generator of the positions of the set bits of the mask, lowest first
+    """
+    while mask:
+        bit = mask & -mask
+        yield bit.bit_length() - 1
+        mask ^= bit
+
+
+class FactorUniverse:
+    """
+    Interns factors to bit positions so that sets of factors can be represented as integer bitmasks
+    e.g. once p1 has bit 0b01 and p2 has bit 0b10, frozenset{p1, p2} is encoded as 0b11
+    Subset testing then becomes (a & b) == a, and intersection becomes a & b
+    """
+
+    def __init__(self):
+        self.bits = {}
+        self.factors = []
+        self.masks = {}
+
+    def bit(self, factor):
+        """
+        @param factor: a factor (or any hashable) to intern
+        @return: the single bit mask of the factor, assigning the next free bit on first use
+        """
+        bit = self.bits.get(factor)
+        if bit is None:
+            bit = self.bits[factor] = 1 << len(self.factors)
+            self.factors.append(factor)
+        return bit
+
+    def encode(self, factor_set):
+        """
+        @param factor_set: a frozenset of factors
+        @return: the integer bitmask of the factor_set, remembered so each distinct set is only encoded once
+        Any factor new to the universe is given a bit, so this is for the sets inserted into an order
+        """
+        mask = self.masks.get(factor_set)
+        if mask is None:
+            mask = 0
+            for factor in factor_set:
+                mask |= self.bit(factor)
+            self.masks[factor_set] = mask
+        return mask
+
+    def lookup(self, factor_set):
+        """
+        @param factor_set: a frozenset of factors
+        @return: the bitmask of the factors of the factor_set which are already in the universe.
+                 Unlike encode, nothing is added to the universe, so queries do not widen it
+        """
+        mask = self.masks.get(factor_set)
+        if mask is None:
+            bits = self.bits
+            mask = 0
+            for factor in factor_set:
+                mask |= bits.get(factor, 0)
+        return mask
+
+    def decode(self, mask):
+        """
+        @param mask: an integer bitmask produced by encode
+        @return: the frozenset of factors represented by the mask
+        """
+        factors = self.factors
+        return frozenset(factors[position] for position in iter_bits(mask))
+
+    def __len__(self):
+        return len(self.factors)
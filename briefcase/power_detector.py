@@ -21,7 +21,7 @@ class PowerDetector():
         for factor in case.reason:
             self.factor_list[reason_pol].add(factor)
 
-        for factor in case.defeated():
+        for factor in case.defeated:
             self.factor_list[defeated_pol].add(factor)
 
     def max_edges(self):
@@ -48,7 +48,7 @@ class PowerDetector():
         defeated_set = set()
         for case in cases:
             reasons_set.add(case.reason)
-            defeated_set.add(case.defeated())
+            defeated_set.add(case.defeated)
         reasons_union = frozenset().union(*reasons_set)
 
         # Initialize intersection_set with the elements of the first frozen set
@@ -63,7 +63,7 @@ class PowerDetector():
     def case_power(self, case):
         copy_factor_list = self.factor_list
         self.add_factor_list(case)
-        edges_count = self.supersets_count(case.decision, case.reason) * self.subsets_count(case.defeated())
+        edges_count = self.supersets_count(case.decision, case.reason) * self.subsets_count(case.defeated)
         self.factor_list = copy_factor_list
         return edges_count
 
@@ -3,18 +3,57 @@ from itertools import combinations
 from briefcase.power_detector import PowerDetector
 from briefcase.admissibility_constraints import AdmissibilityConstraints
 from briefcase.enums import incons_enum, decision_enum
+from briefcase.factor_universe import FactorUniverse, iter_bits
+
+
+class PolarityPartition:
+    """
+    The defeated sets of the order which share one polarity, each given an id local to the partition.
+    Keeping the ids per polarity keeps the posting bitmaps of the defeated_factor_index narrow.
+    """
+
+    def __init__(self, polarity):
+        self.polarity = polarity
+        self.defeated_ids = {}
+        self.id_to_defeated = []
+        self.id_to_reasons = []
+
+    def add_defeated(self, defeated_mask, defeated, reasons):
+        """
+        @param defeated_mask: bitmask of the defeated set
+        @param defeated: the defeated frozenset
+        @param reasons: the set of reason bitmasks of the defeated set
+        @return: the id of the defeated set in this partition, or None if it already had one
+        """
+        if defeated_mask in self.defeated_ids:
+            return None
+        defeated_id = self.defeated_ids[defeated_mask] = len(self.id_to_defeated)
+        self.id_to_defeated.append(defeated)
+        self.id_to_reasons.append(reasons)
+        return defeated_id
 
 
 class PriorityOrder:
     """
     Orders reasons and factors in a dictionary.
     Key is a frozenset of the stronger factors, value is a frozenset of the weaker factors.
+    The same order is mirrored on integer bitmasks (see FactorUniverse) for the consistency checks,
+    with the defeated sets split into a PolarityPartition per polarity.
     """
 
     def __init__(self, cb, empty_sides=False):
         self.cb = cb
         self.order = defaultdict(set)
-        self.defeated_factor_index = defaultdict(set)
+        self._intern = {}
+        self.universe = FactorUniverse()
+        self.mask_order = defaultdict(set)
+        self.partitions = {}
+        self.bit_partitions = {}
+        self.defeated_factor_index = defaultdict(int)
+        self.snapshot_id = 0
+        self._cache_snapshot_id = 0
+        self._consistency_cache = {}
+        self._cb_consistent = None
         self.admissibility_constraints = AdmissibilityConstraints(self)
         self.PD = PowerDetector(self)
         self.empty_sides=empty_sides
@@ -22,6 +61,22 @@ class PriorityOrder:
     def get_cases(self):
         return self.cb.cases
 
+    def get_case_masks(self):
+        """
+        @return: the (decision, reason mask, defeated mask) of each case of the case base, see encode_case
+        """
+        return self.cb.case_masks
+
+    def encode_case(self, case):
+        """
+        @param case: a case entering the case base
+        @return: (decision, reason mask, defeated mask) of the case.
+                 Each case is encoded once on entry, so constraints comparing a new case against every case
+                 of the case base only do bitwise operations
+        """
+        encode = self.universe.encode
+        return case.decision, encode(case.reason), encode(case.defeated)
+
     def get_incons_pairs_with_case(self, new_reason, new_defeated):
         """
         @param new_reason: a frozenset of factors
@@ -48,26 +103,72 @@ class PriorityOrder:
 
     def is_existing_claim(self, new_reason, new_defeated):
         """Checks priority order remains the same"""
+        defeated_mask = self.universe.lookup(new_defeated)
+        # a factor missing from the universe is in no defeated set, so new_defeated has no supersets
+        if defeated_mask.bit_count() != len(new_defeated):
+            return False
+        reason_mask = self.universe.lookup(new_reason)
+        partition, ids = self.get_stronger_defeat_ids(defeated_mask)
         # if there exists a case with a stronger than or equal to defeated
-        for stronger_defeat in self.get_stronger_defeats(new_defeated):
+        for defeated_id in iter_bits(ids):
             # and with a weaker or equal to reason
-            if any(new_reason.issuperset(reason) for reason in self.order[stronger_defeat]):
+            if any(reason & reason_mask == reason for reason in partition.id_to_reasons[defeated_id]):
                 return True
         return False
 
     def get_stronger_defeats(self, factor_set):
-        # Retrieve all entries in defeated_factor_index for all factors within factor_set (defeats_that_intersect)
-        # Cast existing set of references to a frozenset within a set
-        defeats_that_intersect = {frozenset(self.defeated_factor_index[factor]) for factor in factor_set}
-
-        # Find the intersection of all sets retrieved above, exploiting the references property
-        # This gives us all sets of factors which are stronger than our factor_set - supersets
-        # To optimise this, we order by size so that initially smaller sets are compared for intersections
-        sorted_defeats_that_intersect = sorted(defeats_that_intersect, key=lambda x: len(x))
-        if sorted_defeats_that_intersect:
-            supersets = frozenset.intersection(*sorted_defeats_that_intersect)
-            return supersets
-        return []
+        """
+        @param factor_set: a frozenset of factors
+        @return: all defeated frozensets in the order which are supersets of the factor_set
+        """
+        mask = self.universe.lookup(factor_set)
+        if mask.bit_count() != len(factor_set):
+            return []
+        partition, ids = self.get_stronger_defeat_ids(mask)
+        if not ids:
+            return []
+        id_to_defeated = partition.id_to_defeated
+        return [id_to_defeated[defeated_id] for defeated_id in iter_bits(ids)]
+
+    def get_stronger_defeat_ids(self, mask):
+        """
+        @param mask: a bitmask of factors
+        @return: the partition of the mask's polarity, and a bitmap (int) of the ids in that partition of all
+                 defeated sets in the order which are supersets of the mask
+        """
+        # Every superset of the mask appears in the posting bitmap of each of its factors,
+        # so the supersets are the intersection of those bitmaps.
+        # The intersection of two bitmaps costs the width of the narrower one, so we seed with the narrowest
+        # bitmap; the running intersection can then only get narrower. We stop as soon as it is empty
+        # Only defeated sets of the same polarity as the mask can be supersets of it
+        lowest_bit = mask & -mask
+        partition = self.bit_partitions.get(lowest_bit)
+        if partition is None:
+            return None, 0
+
+        index = self.defeated_factor_index
+        bit_partitions = self.bit_partitions
+        # A single factor's supersets are exactly its posting bitmap, no intersection needed
+        if mask == lowest_bit:
+            return partition, index[lowest_bit]
+
+        postings = []
+        while mask:
+            bit = mask & -mask
+            # a mask mixing polarities has no supersets, and ids from another partition must not be intersected
+            if bit_partitions.get(bit) is not partition:
+                return partition, 0
+            posting = index[bit]
+            postings.append(posting)
+            mask ^= bit
+
+        ids = min(postings, key=int.bit_length)
+        for posting in postings:
+            if posting is not ids:
+                ids &= posting
+                if not ids:
+                    return partition, 0
+        return partition, ids
 
     # def get_weaker_defeats(self, factor_set):
     #     # Retrieve all entries in defeated_factor_index which are weaker than a given factor set
@@ -98,16 +199,85 @@ class PriorityOrder:
         """
         @param reason: a frozenset of factors
         @param defeated: a frozenset of factors, weaker than the reason
-        Adds defeated: reason to the cb order.
-        Adds all factors within the defeated set to the defeated_subsets dictionary with the
-        defeated frozenset as key and a set of frozensets as values
+        Adds defeated: reason to the cb order. A ValueError is raised if the defeated factors mix polarities.
+        Mirrors the pair as bitmasks in mask_order. Each new defeated set is given an id in the partition
+        of its polarity, which is added to the posting bitmap of each of its factor bits in defeated_factor_index
+        Equal frozensets are interned, so cases sharing a reason or defeated set share one object
         """
+        new_defeated = self._add_order(reason, defeated)
+        if new_defeated is not None:
+            partition, defeated_id, defeated_mask = new_defeated
+            id_bit = 1 << defeated_id
+            for position in iter_bits(defeated_mask):
+                bit = 1 << position
+                self.defeated_factor_index[bit] |= id_bit
+                self.bit_partitions[bit] = partition
 
-        if reason != frozenset() and defeated != frozenset():
-            self.order[defeated].add(reason)
+    def add_orders_with_subsets(self, pairs):
+        """
+        @param pairs: iterable of (reason, defeated) pairs of frozensets
+        Adds each pair as add_order_with_subsets does.
+        The new ids are first gathered per factor bit, then each posting bitmap is built once from a
+        preallocated buffer, rather than growing the (immutable) int bitmap one id at a time
+        """
+        new_ids = defaultdict(list)
+        try:
+            for reason, defeated in pairs:
+                new_defeated = self._add_order(reason, defeated)
+                if new_defeated is not None:
+                    partition, defeated_id, defeated_mask = new_defeated
+                    for position in iter_bits(defeated_mask):
+                        bit = 1 << position
+                        new_ids[bit].append(defeated_id)
+                        self.bit_partitions[bit] = partition
+        finally:
+            # index the pairs added before any rejected one, so the order stays queryable
+            for bit, ids in new_ids.items():
+                posting = bytearray(max(ids) // 8 + 1)
+                for defeated_id in ids:
+                    posting[defeated_id >> 3] |= 1 << (defeated_id & 7)
+                self.defeated_factor_index[bit] |= int.from_bytes(posting, "little")
 
-            for factor in defeated:
-                self.defeated_factor_index[factor].add(defeated)
+    def _add_order(self, reason, defeated):
+        """
+        Adds the pair to order and mask_order, and gives the defeated set an id if it is new
+        @return: (partition, id, bitmask) of the defeated set if it is new to the order, otherwise None
+        """
+        if reason == frozenset() or defeated == frozenset():
+            return None
+
+        partition = self.get_partition(defeated)
+        reason = self._intern.setdefault(reason, reason)
+        defeated = self._intern.setdefault(defeated, defeated)
+        self.order[defeated].add(reason)
+
+        reason_mask = self.universe.encode(reason)
+        defeated_mask = self.universe.encode(defeated)
+        reasons = self.mask_order[defeated_mask]
+        if reason_mask not in reasons:
+            reasons.add(reason_mask)
+            self.snapshot_id += 1
+
+        defeated_id = partition.add_defeated(defeated_mask, defeated, reasons)
+        if defeated_id is None:
+            return None
+        return partition, defeated_id, defeated_mask
+
+    def get_partition(self, factor_set):
+        """
+        @param factor_set: a non-empty frozenset of factors, all of one polarity
+        @return: the PolarityPartition for the polarity of the factor_set, created on first use
+        A factor_set mixing polarities raises a ValueError, as its factor bits would need postings in two partitions
+        """
+        polarities = {getattr(factor, "polarity", decision_enum.un) for factor in factor_set}
+        if len(polarities) > 1:
+            raise ValueError(f"The defeated factors {set(factor_set)} mix the polarities {polarities}, "
+                             f"all defeated factors must have one polarity")
+        polarity = polarities.pop()
+        partition = self.partitions.get(polarity)
+        if partition is None:
+            partition = self.partitions[polarity] = PolarityPartition(polarity)
+        return partition
 
     def is_consistent(self, new_reason, new_defeated):
         """
@@ -116,26 +286,75 @@ class PriorityOrder:
         @return: True/False if for the new_reason being stronger than the new_defeated,
                 this causes inconsistency with the existing Case Base order
         """
-        supersets = self.get_stronger_defeats(new_reason)
+        # An empty reason is stronger than no defeated set
+        if not new_reason:
+            return True
+        reason_mask = self.universe.lookup(new_reason)
+        # a factor missing from the universe is in no defeated set, so new_reason has no supersets
+        if reason_mask.bit_count() != len(new_reason):
+            return True
+        # factors of new_defeated missing from the universe are in no reason, so can be left out of the subset tests
+        return self.is_mask_consistent(reason_mask, self.universe.lookup(new_defeated))
 
-        # Looking at each (defeated) superset within the set of supersets,
-        # Retrieve the (reason) entry in the existing order dictionary - this will be a set of reasons for each
-        # Intersecting case
-        reasons_sets = [self.order[superset] for superset in supersets]
+    def refresh_cache(self):
+        """
+        Clears the cached consistency results if the order has changed since they were computed
+        """
+        if self._cache_snapshot_id != self.snapshot_id:
+            self._consistency_cache.clear()
+            self._cb_consistent = None
+            self._cache_snapshot_id = self.snapshot_id
 
-        # If for any of the existing reasons sets retrieved, if the new defeated is a superset of one of
-        # the sets of old reasons, return False (inconsistent)
-        return not any(any(reason.issubset(new_defeated) for reason in reasons) for reasons in reasons_sets)
+    def is_mask_consistent(self, reason_mask, defeated_mask):
+        """
+        @param reason_mask: a bitmask of factors
+        @param defeated_mask: a bitmask of factors, weaker than the reason
+        @return: True/False as is_consistent, for a pair already encoded by the universe
+        Results are cached until the order next changes
+        """
+        self.refresh_cache()
+        key = (reason_mask, defeated_mask)
+        consistent = self._consistency_cache.get(key)
+        if consistent is None:
+            consistent = self._consistency_cache[key] = self._is_mask_consistent(reason_mask, defeated_mask)
+        return consistent
+
+    def _is_mask_consistent(self, reason_mask, defeated_mask):
+        # Looking at each (defeated) superset of the new reason, retrieve the (reason) masks in the order.
+        # If the new defeated is a superset of one of those old reasons, return False (inconsistent)
+        partition, ids = self.get_stronger_defeat_ids(reason_mask)
+        if not ids:
+            return True
+        id_to_reasons = partition.id_to_reasons
+        for defeated_id in iter_bits(ids):
+            for reason in id_to_reasons[defeated_id]:
+                if reason & defeated_mask == reason:
+                    return False
+        return True
+
+    def are_cases_consistent(self, cases):
+        """
+        @param cases: list of cases
+        @return: list of True/False for each case, if the current cb order would be consistent with it added
+        """
+        return [self.is_consistent(case.reason, case.defeated) for case in cases]
 
     def is_cb_consistent(self):
         """
         @return : True/False if current ordering of the cb order is consistent
         Inconsistency must be strict
+        The result is cached until the order next changes
         """
-        # loop through all cases in order
-        for defeated, reason_set in self.order.items():
+        self.refresh_cache()
+        if self._cb_consistent is None:
+            self._cb_consistent = self._is_cb_consistent()
+        return self._cb_consistent
+
+    def _is_cb_consistent(self):
+        # loop through all cases in order, every edge is distinct so the per-pair cache is bypassed
+        for defeated, reason_set in self.mask_order.items():
             for reason in reason_set:
-                if not self.is_consistent(reason, defeated):
+                if not self._is_mask_consistent(reason, defeated):
                     return False
         return True
 
@@ -144,7 +363,7 @@ class PriorityOrder:
         @param case: a new case
         @return: True/False if the current cb order would be consistent with a new case added
         """
-        return self.is_consistent(case.reason, case.defeated())
+        return self.is_consistent(case.reason, case.defeated)
 
     def unsafe_add_case(self, case):
         """
@@ -152,18 +371,36 @@ class PriorityOrder:
         Adds a new case to order dict with no safety checks for inconsistency
         """
         # case 1: we know the winning reason is at least as strong as the defeated factors, since it won
-        if (case.reason and case.defeated()) or self.empty_sides: # cannot have an empty side
-            self.add_order_with_subsets(case.reason, case.defeated())
+        if (case.reason and case.defeated) or self.empty_sides: # cannot have an empty side
+            self.add_order_with_subsets(case.reason, case.defeated)
             self.PD.add_factor_list(case)
             return True
         return False
 
+    def unsafe_add_cases(self, cases):
+        """
+        @param cases: the new cases to be added to the priority order
+        @return: list of the cases which were added
+        Adds new cases to order dict with no safety checks for inconsistency.
+        The (reason, defeated) pairs are staged first, so a pair repeated across cases is only added once
+        """
+        added_cases = []
+        pending = {}
+        for case in cases:
+            if (case.reason and case.defeated) or self.empty_sides:  # cannot have an empty side
+                pending[case.reason, case.defeated] = None
+                self.PD.add_factor_list(case)
+                added_cases.append(case)
+
+        self.add_orders_with_subsets(pending)
+        return added_cases
+
     def safe_add_case(self, case, incons):
         """
         @param case: the new case to be added to the priority order
         @param incons: the constraint to be used when adding the new case to the priority order
         """
-        if self.admissibility_constraints.is_case_admissible(case.reason, case.defeated(), incons):
+        if self.admissibility_constraints.is_case_admissible(case.reason, case.defeated, incons):
             self.unsafe_add_case(case)
             return True
         return False
@@ -172,8 +409,6 @@ class PriorityOrder:
         """
         @return: String representation of the PriorityOrder for human-readable output
         """
-        cases_str = []
-        for winning, defeated in self.order.items():
-            cases_str.append("Reason: " + str(winning) + ", Defeated: " + str(defeated))
-        cases_formatted = "\n".join(cases_str)
+        cases_formatted = "\n".join(f"Reason: {winning!s}, Defeated: {defeated!s}"
+                                    for winning, defeated in self.order.items())
         return f"\nPriority Order:\n{cases_formatted}"
@@ -3,6 +3,7 @@ import import_ipynb
 from big_dataset_utility.cluster_binary_factors import cluster_factors_voting, cluster_factors_rand_un, \
     cluster_factors_corr, cluster_factors_rand
 import yaml
+from big_dataset_utility.yaml_loader import load_yaml
 
 
 def get_df():
@@ -98,7 +99,7 @@ def get_existing_test_data(cluster="corr", test_split="0.25"):
 
     try:
         with open(filename, 'r') as file:
-            data = yaml.safe_load(file)
+            data = load_yaml(file)
         print(f"Loaded data successfully from '{filename}'")
     except FileNotFoundError:
         print(f"File '{filename}' not found.")
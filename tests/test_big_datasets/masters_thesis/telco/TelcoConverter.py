@@ -5,6 +5,7 @@ import pandas as pd
 from big_dataset_utility.cluster_binary_factors import cluster_factors_voting, cluster_factors_rand_un, \
     cluster_factors_corr, cluster_factors_rand, reduce_df
 import yaml
+from big_dataset_utility.yaml_loader import load_yaml
 import math
 from collections import defaultdict
 import statistics
@@ -144,7 +145,7 @@ def get_existing_test_data(cluster="corr", test_split="0.25", size_filter=False)
 
     try:
         with open(filename, 'r') as file:
-            data = yaml.safe_load(file)
+            data = load_yaml(file)
         print(f"Loaded data successfully from '{filename}'")
     except FileNotFoundError:
         print(f"File '{filename}' not found.")
@@ -236,9 +237,9 @@ def test_admit_bf_incons(shuffles):
                 cb_power = cb.order.PD.cb_power()
                 if polarity == decision_enum.pi:
                     pi_factors = add_dict(pi_factors, new_case.reason)
-                    delta_factors = add_dict(delta_factors, new_case.defeated())
+                    delta_factors = add_dict(delta_factors, new_case.defeated)
                 else:
-                    pi_factors = add_dict(pi_factors, new_case.defeated())
+                    pi_factors = add_dict(pi_factors, new_case.defeated)
                     delta_factors = add_dict(delta_factors, new_case.reason)
                 break
         powers.append(cb_power)
@@ -3,6 +3,8 @@ import pytest
 import yaml
 from briefcase.case import Case
 from briefcase.case_base import CaseBase
+from briefcase.enums import decision_enum
+from briefcase.factor import Factor
 
 
 # Define a fixture to load test cases from the YAML file
@@ -73,3 +75,37 @@ def test_is_case_admissible_not(test_cases, test_case_name):
         with pytest.raises(KeyError):
             if not cb1.add_case(case, None):
                 fails_results.append(case)
+
+
+def mrd_by_sets(cases, new_case):
+    # the mrd constraint, computed with Case.relevant_diff_from
+    opposing_case = new_case.polar_opposite()
+    min_case_size = None
+    best_decision = new_case.decision
+    for case in cases:
+        diffs = len((new_case if case.decision == new_case.decision else opposing_case).relevant_diff_from(case))
+        if min_case_size is None or diffs < min_case_size or (diffs == min_case_size
+                                                              and best_decision != new_case.decision):
+            min_case_size = diffs
+            best_decision = case.decision
+    return best_decision == new_case.decision
+
+
+def test_mrd_matches_relevant_diff_from(test_cases):
+    cs = test_cases["mrd"]
+    cb1 = CaseBase([Case.from_dict(c) for c in cs["cases"]])
+    assert len(cb1.case_masks) == len(cb1.cases)
+    size = len(cb1.order.universe)
+
+    new_factors = [frozenset(), frozenset({Factor("p9", decision_enum.pi), Factor("p10", decision_enum.pi)}),
+                   frozenset({Factor("d9", decision_enum.delta)})]
+    for add in [Case.from_dict(c) for c in cs["adds"]]:
+        for new_pi in new_factors[:2]:
+            for new_delta in new_factors[::2]:
+                new_reason = add.reason | (new_pi if add.decision == decision_enum.pi else new_delta)
+                new_defeated = add.defeated | (new_delta if add.decision == decision_enum.pi else new_pi)
+                new_case = Case.from_reason_defeated(new_reason, new_defeated)
+                assert (cb1.order.admissibility_constraints.mrd(new_reason, new_defeated)
+                        == mrd_by_sets(cb1.cases, new_case))
+    # the new factors are only looked up, never added to the universe
+    assert len(cb1.order.universe) == size
@@ -59,3 +59,14 @@ def test_add_wrong_incons_enum(test_cases, test_case_name):
     cb1 = CaseBase()
     with pytest.raises(KeyError):
         cb1.add_cases(cases, "random-wrong")
+
+
+def test_caselist_not_mutated_or_aliased(test_cases):
+    case = Case.from_dict(test_cases["simple_small"][0])
+    other = Case.from_dict(test_cases["simple_small"][1])
+    caselist = [case]
+    cb = CaseBase(caselist)
+    cb.add_unsafe_cases([other])
+    assert cb.cases is not caselist
+    assert caselist == [case]
+    assert cb.cases == [case, other]
@@ -10,3 +10,13 @@ def test_factor_repr():
     factor = Factor("test_factor", "pi")
     expected_repr = "Factor('test_factor', 'pi')"
     assert repr(factor) == expected_repr
+
+
+def test_factor_hash_eq():
+    factor1 = Factor("test_factor", "pi")
+    factor2 = Factor("test_factor", "pi")
+    assert factor1 == factor2
+    assert hash(factor1) == hash(factor2)
+    assert factor1 != Factor("test_factor", "delta")
+    with pytest.raises(AttributeError):
+        factor1.name = "other_factor"
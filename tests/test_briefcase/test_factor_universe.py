@@ -0,0 +1,32 @@
+from briefcase.enums import decision_enum
+from briefcase.factor import Factor
+from briefcase.factor_universe import FactorUniverse
+
+
+def test_encode_decode():
+    universe = FactorUniverse()
+    p1 = Factor("p1", decision_enum.pi)
+    p2 = Factor("p2", decision_enum.pi)
+    d1 = Factor("d1", decision_enum.delta)
+    mask = universe.encode(frozenset({p1, d1}))
+    assert universe.decode(mask) == frozenset({p1, d1})
+    assert universe.encode(frozenset()) == 0
+    assert len(universe) == 2
+    assert universe.encode(frozenset({p1, p2})) & mask == universe.bit(p1)
+
+
+def test_bit_polarity_sensitive():
+    universe = FactorUniverse()
+    assert universe.bit(Factor("f", decision_enum.pi)) != universe.bit(Factor("f", decision_enum.delta))
+    assert universe.bit(Factor("f", decision_enum.pi)) == universe.bit(Factor("f", decision_enum.pi))
+
+
+def test_lookup_does_not_add():
+    universe = FactorUniverse()
+    p1 = Factor("p1", decision_enum.pi)
+    p2 = Factor("p2", decision_enum.pi)
+    mask = universe.encode(frozenset({p1}))
+    assert universe.lookup(frozenset({p1, p2})) == mask
+    assert universe.lookup(frozenset({p2})) == 0
+    assert len(universe) == 1
+    assert len(universe.masks) == 1
@@ -4,6 +4,8 @@ import yaml
 from briefcase.case import Case
 from briefcase.priority_order import PriorityOrder
 from briefcase.case_base import CaseBase
+from briefcase.enums import decision_enum
+from briefcase.factor import Factor
 
 from collections import Counter
 
@@ -74,10 +76,10 @@ def test_add_order_with_subsets_id(test_cases, test_case_name):
     cs = test_cases[test_case_name]
     case = Case.from_dict(cs[0])  # get first case
     order = PriorityOrder(CaseBase())  # blank priority order
-    order.add_order_with_subsets(case.reason, case.defeated())  # add one element
+    order.add_order_with_subsets(case.reason, case.defeated)  # add one element
     # check if items added, and that the id is the same id
-    assert any(case.defeated() is obj for obj in order.order.keys())
-    assert any(case.defeated() is obj for subset in order.defeated_factor_index.values() for obj in subset)
+    assert any(case.defeated is obj for obj in order.order.keys())
+    assert any(case.defeated is obj for partition in order.partitions.values() for obj in partition.id_to_defeated)
 
 
 @pytest.mark.parametrize(
@@ -94,8 +96,8 @@ def test_get_incons_pairs_with_case(test_cases, test_case_name):
 
     inconsistent_case = Case.from_dict(cs[-1])
 
-    answer = [(cases[v].reason, cases[v].defeated()) for v in test_cases[test_case_name]['answer']]
-    expected = cb1.order.get_incons_pairs_with_case(inconsistent_case.reason, inconsistent_case.defeated())
+    answer = [(cases[v].reason, cases[v].defeated) for v in test_cases[test_case_name]['answer']]
+    expected = cb1.order.get_incons_pairs_with_case(inconsistent_case.reason, inconsistent_case.defeated)
     assert Counter(expected) == Counter(answer)
 
 def test_priority_order_str_order():
@@ -112,4 +114,168 @@ def test_priority_order_str_order():
     expected_str_2 = "\nPriority Order:\nReason: frozenset({'factor2'}), Defeated: {frozenset({'factor1'})}\nReason: frozenset({'factor4', 'factor5'}), Defeated: {frozenset({'factor3'})}"
     actual = priority_order.str_order()
     # Check the string representation returned by str_order
-    assert actual == expected_str or actual == expected_str_2
\ No newline at end of file
+    assert actual == expected_str or actual == expected_str_2
+
+
+@pytest.mark.parametrize(
+    "test_case_name",
+    [
+        "simple_small",
+        "multi_defeated_big",
+    ],
+)
+def test_unsafe_add_cases(test_cases, test_case_name):
+    cases = [Case.from_dict(c) for c in test_cases[test_case_name]]
+    bulk_order = PriorityOrder(CaseBase())
+    assert bulk_order.unsafe_add_cases(cases + cases) == cases + cases
+
+    single_order = PriorityOrder(CaseBase())
+    for case in cases:
+        single_order.unsafe_add_case(case)
+    assert bulk_order.order == single_order.order
+    assert bulk_order.mask_order == single_order.mask_order
+    assert bulk_order.defeated_factor_index == single_order.defeated_factor_index
+
+
+@pytest.mark.parametrize(
+    "test_case_name",
+    [
+        "simple_big",
+        "multi_defeated_big",
+    ],
+)
+def test_polarity_partitions(test_cases, test_case_name):
+    cases = [Case.from_dict(c) for c in test_cases[test_case_name]]
+    order = CaseBase(cases).order
+    for polarity, partition in order.partitions.items():
+        assert all(next(iter(defeated)).polarity == polarity for defeated in partition.id_to_defeated)
+    for bit, posting in order.defeated_factor_index.items():
+        assert posting.bit_length() <= len(order.bit_partitions[bit].id_to_defeated)
+
+
+def test_add_order_with_subsets_interns(test_cases):
+    case = Case.from_dict(test_cases["simple_small"][0])
+    order = PriorityOrder(CaseBase())
+    order.add_order_with_subsets(case.reason, case.defeated)
+    order.add_order_with_subsets(frozenset(list(case.reason)), frozenset(list(case.defeated)))
+    assert len(order.order) == 1
+    assert all(reason is case.reason for reason in order.order[case.defeated])
+    assert order.get_stronger_defeats(case.defeated) == [case.defeated]
+    assert order.get_stronger_defeats(case.defeated)[0] is case.defeated
+
+
+class CountingDict(dict):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.gets = 0
+
+    def get(self, *args):
+        self.gets += 1
+        return super().get(*args)
+
+
+def test_is_consistent_short_circuits(test_cases, monkeypatch):
+    cs = test_cases["simple_small"]
+    cases = [Case.from_dict(c) for c in cs[:-1]]
+    order = CaseBase(cases).order
+    inconsistent_case = Case.from_dict(cs[-1])
+
+    def no_lookup(mask):
+        raise AssertionError("an empty reason must not be looked up")
+
+    with monkeypatch.context() as m:
+        m.setattr(order, "get_stronger_defeat_ids", no_lookup)
+        assert order.is_consistent(frozenset(), inconsistent_case.defeated)
+
+    # a single factor reason takes its posting bitmap as is, checking no other bit's partition
+    order.bit_partitions = CountingDict(order.bit_partitions)
+    assert len(inconsistent_case.reason) == 1
+    assert not order.is_consistent(inconsistent_case.reason, inconsistent_case.defeated)
+    assert order.bit_partitions.gets == 1
+
+
+def test_consistency_cache_invalidated(test_cases, monkeypatch):
+    cs = test_cases["simple_small"]
+    cb1 = CaseBase([Case.from_dict(c) for c in cs[:-1]])
+    inconsistent_case = Case.from_dict(cs[-1])
+    order = cb1.order
+
+    calls = Counter()
+    for name in ("_is_cb_consistent", "_is_mask_consistent"):
+        def counted(*args, name=name, method=getattr(order, name)):
+            calls[name] += 1
+            return method(*args)
+        monkeypatch.setattr(order, name, counted)
+
+    assert cb1.is_cb_consistent()
+    assert cb1.is_cb_consistent()
+    assert calls["_is_cb_consistent"] == 1
+    assert not cb1.is_consistent_with(inconsistent_case)
+    mask_checks = calls["_is_mask_consistent"]
+    assert not cb1.is_consistent_with(inconsistent_case)
+    assert calls["_is_mask_consistent"] == mask_checks
+
+    snapshot_id = order.snapshot_id
+    cb1.add_case(inconsistent_case)
+    assert order.snapshot_id > snapshot_id
+    mask_checks = calls["_is_mask_consistent"]
+    cb1.is_consistent_with(inconsistent_case)
+    assert calls["_is_mask_consistent"] == mask_checks + 1
+    assert not cb1.is_cb_consistent()
+    assert calls["_is_cb_consistent"] == 2
+
+
+def test_get_stronger_defeats_mixed_polarity():
+    p1, p2 = Factor("p1", decision_enum.pi), Factor("p2", decision_enum.pi)
+    d1, d2 = Factor("d1", decision_enum.delta), Factor("d2", decision_enum.delta)
+    cb1 = CaseBase([
+        Case(frozenset({p1}), frozenset({d1}), decision_enum.pi, frozenset({p1})),
+        Case(frozenset({p2}), frozenset({d2}), decision_enum.delta, frozenset({d2})),
+    ])
+    # both defeated sets have id 0 in their own partitions
+    assert cb1.order.get_stronger_defeats(frozenset({d1, p2})) == []
+    assert cb1.order.get_stronger_defeats(frozenset({p2, d1})) == []
+    assert cb1.order.get_stronger_defeats(frozenset({d1})) == [frozenset({d1})]
+
+
+def test_universe_owned_by_order(test_cases):
+    cases = [Case.from_dict(c) for c in test_cases["mega_case_10"]]
+    big_cb = CaseBase(cases)
+    small_cb = CaseBase(cases[:1])
+    assert small_cb.order.universe is not big_cb.order.universe
+    assert len(small_cb.order.universe) == len(cases[0].reason | cases[0].defeated)
+
+
+def test_queries_do_not_grow_universe(test_cases):
+    cs = test_cases["simple_small"]
+    cb1 = CaseBase([Case.from_dict(c) for c in cs[:-1]])
+    inconsistent_case = Case.from_dict(cs[-1])
+    universe = cb1.order.universe
+    size, memo_size = len(universe), len(universe.masks)
+
+    p_new = Factor("p_new", decision_enum.pi)
+    d_new = Factor("d_new", decision_enum.delta)
+    new_reason = inconsistent_case.reason | {p_new}
+    new_defeated = inconsistent_case.defeated | {d_new}
+    assert cb1.order.is_consistent(new_reason, inconsistent_case.defeated)
+    assert not cb1.order.is_consistent(inconsistent_case.reason, new_defeated)
+    assert cb1.order.get_stronger_defeats(new_defeated) == []
+    assert not cb1.order.is_existing_claim(inconsistent_case.reason, new_defeated)
+    assert len(universe) == size
+    assert len(universe.masks) == memo_size
+
+
+def test_add_order_rejects_mixed_polarity_defeated():
+    p1, p2 = Factor("p1", decision_enum.pi), Factor("p2", decision_enum.pi)
+    d1, d2 = Factor("d1", decision_enum.delta), Factor("d2", decision_enum.delta)
+    order = PriorityOrder(CaseBase())
+    with pytest.raises(ValueError):
+        order.add_order_with_subsets(frozenset({p1}), frozenset({d1, p2}))
+    assert not order.order and not order.mask_order and not order.partitions
+
+    with pytest.raises(ValueError):
+        order.add_orders_with_subsets([(frozenset({p1}), frozenset({d1, d2})),
+                                       (frozenset({p2}), frozenset({d1, p1}))])
+    # the pair added before the rejected one is still indexed
+    assert order.get_stronger_defeats(frozenset({d1})) == [frozenset({d1, d2})]
+    assert not order.is_consistent(frozenset({d1}), frozenset({p1}))
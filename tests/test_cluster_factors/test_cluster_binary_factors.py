@@ -2,7 +2,7 @@ import os
 
 import numpy as np
 import pytest
-import yaml
+from big_dataset_utility.yaml_loader import load_yaml
 import pandas as pd
 from big_dataset_utility.cluster_binary_factors import (cluster_factors_corr, cluster_factors_voting, cluster_factors_rand,
                                                         cluster_factors_rand_un)
@@ -12,7 +12,7 @@ from big_dataset_utility.cluster_binary_factors import (cluster_factors_corr, cl
 def test_cases():
     test_data_path = os.path.join(os.path.dirname(__file__), 'test_data', 'unclustered_casebases.yaml')
     with open(test_data_path, 'r') as file:
-        return yaml.safe_load(file)
+        return load_yaml(file)
 
 
 # Define the tests using the loaded test cases